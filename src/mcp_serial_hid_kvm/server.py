@@ -6,13 +6,18 @@ via TCP.  OCR is run locally using frames fetched from the KVM server.
 
 import asyncio
 import base64
-import datetime
+import concurrent.futures
+import functools
 import io
+import itertools
 import json
 import logging
 import os
+import time
+from collections.abc import Awaitable, Callable
 from typing import Any
 
+import numpy as np
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import ImageContent, TextContent, Tool
@@ -23,43 +28,129 @@ from serial_hid_kvm.hid_keycodes import validate_chars
 from .config import config
 from .ocr import TerminalOCR
 
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+try:
+    import pybase64
+
+    def _b64encode(data: bytes) -> str:
+        return pybase64.b64encode_as_string(data)
+except ImportError:
+
+    def _b64encode(data: bytes) -> str:
+        return base64.standard_b64encode(data).decode("utf-8")
+
+
+try:
+    import orjson
+
+    def _dumps_pretty(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+except ImportError:
 
-# Global instances
-_client: KvmClient | None = None
-_ocr: TerminalOCR | None = None
+    def _dumps_pretty(obj: Any) -> str:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
 
 
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Both are process-wide singletons; functools.cache only stores the result
+# on success, so a failed connect is retried on the next call
+@functools.cache
 def get_client() -> KvmClient:
-    global _client
-    if _client is None:
-        _client = KvmClient(config.kvm_host, config.kvm_port)
-        _client.connect()
-        logger.info("Connected to KVM server")
-    return _client
+    client = KvmClient(config.kvm_host, config.kvm_port)
+    client.connect()
+    logger.info("Connected to KVM server")
+    return client
 
 
+@functools.cache
 def get_ocr() -> TerminalOCR:
-    global _ocr
-    if _ocr is None:
-        _ocr = TerminalOCR(config.tesseract_cmd)
-    return _ocr
+    return TerminalOCR(config.tesseract_cmd)
+
+
+# OCR runs in a dedicated worker process so preprocessing and Tesseract
+# don't hold this process's GIL while mouse/keyboard tool calls are in
+# flight.  One worker: the KVM pipeline only ever OCRs one frame at a time.
+_worker_ocr: TerminalOCR | None = None
+
+
+def _init_ocr_worker() -> None:
+    """Initializer run once in the OCR worker process."""
+    global _worker_ocr
+    # In the worker, let Tesseract fan out a little — it has the process
+    # to itself (overrides the single-frame limit set in ocr.py)
+    os.environ["OMP_THREAD_LIMIT"] = "4"
+    _worker_ocr = TerminalOCR(config.tesseract_cmd)
+
+
+def _ocr_worker(arr: np.ndarray) -> str:
+    """Run OCR on a grayscale frame inside the worker process."""
+    return _worker_ocr.extract_text_from_array(arr)
+
+
+def _warm_ocr_pool() -> bool:
+    """No-op task used to spawn the worker and pay its init cost early."""
+    return _worker_ocr is not None
+
+
+_OCR_POOL = concurrent.futures.ProcessPoolExecutor(
+    max_workers=1, initializer=_init_ocr_worker
+)
+
+
+async def _warm_ocr_pool_async() -> None:
+    """Warm the OCR worker pool, swallowing failures.
+
+    A worker that can't spawn is not fatal — _ocr_frame falls back to
+    in-process OCR when the pool is broken.
+    """
+    try:
+        await asyncio.get_running_loop().run_in_executor(_OCR_POOL, _warm_ocr_pool)
+    except Exception as e:
+        logger.warning(f"OCR worker warmup failed: {e}")
+
+
+async def _ocr_frame(arr: np.ndarray) -> str:
+    """OCR a frame in the worker pool, falling back in-process if it died."""
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(_OCR_POOL, _ocr_worker, arr)
+    except concurrent.futures.process.BrokenProcessPool:
+        logger.warning("OCR worker pool broken; falling back to in-process OCR")
+        return await asyncio.to_thread(get_ocr().extract_text_from_array, arr)
+
+
+# Sequence counter makes burst captures within one second unique instead of
+# overwriting each other; the directory check runs once per process
+_log_seq = itertools.count()
+_log_dir_ready = False
 
 
 def _save_capture_log(image: Image.Image, suffix: str = "") -> str | None:
     """Save a capture image to the log directory if configured."""
+    global _log_dir_ready
     log_dir = config.capture_log_dir
     if log_dir is None:
         return None
 
     try:
-        os.makedirs(log_dir, exist_ok=True)
-        ts = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        if not _log_dir_ready:
+            os.makedirs(log_dir, exist_ok=True)
+            _log_dir_ready = True
+        ts = time.strftime("%Y-%m-%d_%H-%M-%S")
+        seq = next(_log_seq) & 0xFFFF
         tag = f"_{suffix}" if suffix else ""
-        filename = f"{ts}{tag}.jpg"
+        filename = f"{ts}_{seq:04x}{tag}.jpg"
         filepath = os.path.join(log_dir, filename)
-        image.save(filepath, format="JPEG", quality=85)
+        # Skip optional JPEG passes; the log is diagnostic, not archival
+        image.save(
+            filepath,
+            format="JPEG",
+            quality=85,
+            optimize=False,
+            progressive=False,
+            subsampling=2,
+        )
         logger.info(f"Capture log saved: {filepath}")
         return filepath
     except Exception as e:
@@ -67,451 +158,541 @@ def _save_capture_log(image: Image.Image, suffix: str = "") -> str | None:
         return None
 
 
-def _capture_image(quality: int = 85) -> Image.Image:
-    """Fetch a frame from KVM server and return as PIL Image."""
-    jpeg_bytes, w, h = get_client().capture_frame_jpeg(quality)
-    return Image.open(io.BytesIO(jpeg_bytes))
+# Keep references to fire-and-forget save tasks so they aren't GC'd mid-flight
+_save_tasks: set[asyncio.Task] = set()
+
+
+def _save_capture_log_async(image: Image.Image, suffix: str = "") -> None:
+    """Queue a capture-log save without blocking the event loop.
+
+    The JPEG encode + disk write take ~10-30 ms and the filename is never
+    used in tool responses, so the save runs in a worker thread and is not
+    awaited.
+    """
+    if config.capture_log_dir is None:
+        return
+    task = asyncio.create_task(asyncio.to_thread(_save_capture_log, image, suffix))
+    _save_tasks.add(task)
+    task.add_done_callback(_save_tasks.discard)
+
+
+def _capture_array(quality: int = 85) -> np.ndarray:
+    """Fetch a frame from KVM server as a grayscale uint8 array.
+
+    Prefers the server's raw-frame endpoint when available so the JPEG
+    codec is skipped entirely; otherwise decodes the JPEG exactly once.
+    """
+    client = get_client()
+    if hasattr(client, "capture_frame_raw"):
+        frame, w, h = client.capture_frame_raw()
+        # Only usable as-is when the frame is 1-byte-per-pixel grayscale;
+        # packed formats (RGB, YUYV, ...) go through the JPEG path instead
+        if len(frame) == w * h:
+            return np.frombuffer(frame, dtype=np.uint8).reshape(h, w)
+    jpeg_bytes, w, h = client.capture_frame_jpeg(quality)
+    img = Image.open(io.BytesIO(jpeg_bytes))
+    # Hint libjpeg to decode straight to grayscale — skips the chroma
+    # upsampling and the intermediate RGB buffer (~6 MB at 1080p)
+    img.draft("L", img.size)
+    return np.asarray(img.convert("L"), dtype=np.uint8)
+
+
+# Keep image responses under 20MB once base64-encoded
+_MAX_JPEG_BYTES = 10_000_000
+
+
+def _shrink_jpeg(jpeg_bytes: bytes) -> bytes:
+    """Re-encode an oversize JPEG at lower quality, halving size as a last resort."""
+    image = Image.open(io.BytesIO(jpeg_bytes))
+    quality = 85
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=quality)
+    while buffer.tell() > _MAX_JPEG_BYTES and quality > 20:
+        quality -= 15
+        buffer = io.BytesIO()
+        image.save(buffer, format="JPEG", quality=quality)
+    if buffer.tell() > _MAX_JPEG_BYTES:
+        image = image.resize((image.width // 2, image.height // 2))
+        buffer = io.BytesIO()
+        image.save(buffer, format="JPEG", quality=60)
+    return buffer.getvalue()
 
 
 # Create MCP server
 app = Server("mcp-serial-hid-kvm")
 
 
-@app.list_tools()
-async def list_tools() -> list[Tool]:
-    """List available tools."""
-    return [
-        Tool(
-            name="type_text",
-            description=(
-                'Type a string as keyboard input on the target PC. Supports inline tags: {enter}, {tab}, {ctrl+c}, {shift+0x87}, etc. '
-                '{0xNN} sends any HID keycode by hex value (0x00-0xFF) for keys without a named tag, e.g. {0x87} = JIS ろ key (International1).\n'
-                '\n'
-                '**Whitelist-based tag parsing:** Only recognized special key names inside {braces} are interpreted as tags. '
-                'Unknown {content} (e.g. {print $1}) is passed through as literal text including the braces. '
-                'This means code with curly braces (awk, Python, shell) can be sent without escaping in most cases.\n'
-                '\n'
-                '**Escaping:** Use {{ and }} to force literal braces when they collide with a recognized tag name '
-                '(e.g. {{enter}} to type the literal text "{enter}").\n'
-                '\n'
-                '**Raw mode (raw=true):** Disables ALL tag interpretation. '
-                'Actual line breaks in the input (LF, CRLF, CR) are sent as Enter key presses. '
-                'In JSON, \\n is decoded into an actual line break, so it becomes Enter. '
-                'To type a literal backslash + n, use \\\\n in JSON.\n'
-                '\n'
-                'Examples:\n'
-                '  "ls -la{enter}"                     → types "ls -la" then presses Enter\n'
-                '  "awk \'{print $1}\' file.txt{enter}"  → types the awk command then Enter (braces preserved)\n'
-                '  "echo {{enter}}"                    → types "echo {enter}" (escaped to avoid tag)\n'
-                '  raw=true: "ls -la\\necho hi\\n"       → types "ls -la", Enter, "echo hi", Enter\n'
-                '\n'
-                '**Supported characters:** ASCII printable (space through ~), tab, and newline only. '
-                'Unicode, CJK, accented characters, and control characters cause an error. '
-                'For unsupported characters or binary data, use base64 encoding as a workaround: '
-                'encode on the host and type a decode command (e.g. `echo <b64> | base64 -d`) on the target.'
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "text": {
-                        "type": "string",
-                        "description": "Text with optional {tag} sequences. Tags: {enter}/{return}, {space}, {tab}, {backspace}, {delete}, {insert}, {escape}/{esc}, {up}, {down}, {left}, {right}, {home}, {end}, {pageup}, {pagedown}, {f1}-{f12}, {capslock}, {numlock}, {scrolllock}, {printscreen}, {pause}, {0xNN} for raw HID keycodes (0x00-0xFF). Modifiers: ctrl/lctrl/rctrl, shift/lshift/rshift, alt/lalt/ralt, win/lwin/rwin/gui/super/meta — combine with +: {ctrl+c}, {alt+f4}, {ctrl+shift+del}, {shift+0x87}. Only recognized key names are treated as tags; other braces pass through literally.",
-                    },
-                    "raw": {
-                        "type": "boolean",
-                        "description": "If true, disable all {tag} interpretation. Actual line breaks (LF, CRLF, CR) become Enter. In JSON, \\n is decoded into a line break and becomes Enter; \\\\n types literal backslash + n. Default: false.",
-                    },
-                    "char_delay_ms": {
-                        "type": "integer",
-                        "description": "Delay between characters in milliseconds (default: 20)",
-                    },
+# Tool definitions are static — build them once at import instead of
+# reconstructing every Tool object on each list_tools call
+_TOOLS: list[Tool] = [
+    Tool(
+        name="type_text",
+        description=(
+            'Type a string as keyboard input on the target PC. Supports inline tags: {enter}, {tab}, {ctrl+c}, {shift+0x87}, etc. '
+            '{0xNN} sends any HID keycode by hex value (0x00-0xFF) for keys without a named tag, e.g. {0x87} = JIS ろ key (International1).\n'
+            '\n'
+            '**Whitelist-based tag parsing:** Only recognized special key names inside {braces} are interpreted as tags. '
+            'Unknown {content} (e.g. {print $1}) is passed through as literal text including the braces. '
+            'This means code with curly braces (awk, Python, shell) can be sent without escaping in most cases.\n'
+            '\n'
+            '**Escaping:** Use {{ and }} to force literal braces when they collide with a recognized tag name '
+            '(e.g. {{enter}} to type the literal text "{enter}").\n'
+            '\n'
+            '**Raw mode (raw=true):** Disables ALL tag interpretation. '
+            'Actual line breaks in the input (LF, CRLF, CR) are sent as Enter key presses. '
+            'In JSON, \\n is decoded into an actual line break, so it becomes Enter. '
+            'To type a literal backslash + n, use \\\\n in JSON.\n'
+            '\n'
+            'Examples:\n'
+            '  "ls -la{enter}"                     → types "ls -la" then presses Enter\n'
+            '  "awk \'{print $1}\' file.txt{enter}"  → types the awk command then Enter (braces preserved)\n'
+            '  "echo {{enter}}"                    → types "echo {enter}" (escaped to avoid tag)\n'
+            '  raw=true: "ls -la\\necho hi\\n"       → types "ls -la", Enter, "echo hi", Enter\n'
+            '\n'
+            '**Supported characters:** ASCII printable (space through ~), tab, and newline only. '
+            'Unicode, CJK, accented characters, and control characters cause an error. '
+            'For unsupported characters or binary data, use base64 encoding as a workaround: '
+            'encode on the host and type a decode command (e.g. `echo <b64> | base64 -d`) on the target.'
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "text": {
+                    "type": "string",
+                    "description": "Text with optional {tag} sequences. Tags: {enter}/{return}, {space}, {tab}, {backspace}, {delete}, {insert}, {escape}/{esc}, {up}, {down}, {left}, {right}, {home}, {end}, {pageup}, {pagedown}, {f1}-{f12}, {capslock}, {numlock}, {scrolllock}, {printscreen}, {pause}, {0xNN} for raw HID keycodes (0x00-0xFF). Modifiers: ctrl/lctrl/rctrl, shift/lshift/rshift, alt/lalt/ralt, win/lwin/rwin/gui/super/meta — combine with +: {ctrl+c}, {alt+f4}, {ctrl+shift+del}, {shift+0x87}. Only recognized key names are treated as tags; other braces pass through literally.",
+                },
+                "raw": {
+                    "type": "boolean",
+                    "description": "If true, disable all {tag} interpretation. Actual line breaks (LF, CRLF, CR) become Enter. In JSON, \\n is decoded into a line break and becomes Enter; \\\\n types literal backslash + n. Default: false.",
+                },
+                "char_delay_ms": {
+                    "type": "integer",
+                    "description": "Delay between characters in milliseconds (default: 20)",
                 },
-                "required": ["text"],
             },
-        ),
-        Tool(
-            name="send_key",
-            description="Send a single key press with optional modifier keys (e.g., Ctrl+C, Alt+F4).",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "key": {
-                        "type": "string",
-                        "description": "Key name: a-z, 0-9, enter, tab, escape, backspace, delete, up, down, left, right, home, end, pageup, pagedown, f1-f12, space, insert, printscreen",
-                    },
-                    "modifiers": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Modifier keys: ctrl, shift, alt, win (gui/super/meta)",
-                    },
+            "required": ["text"],
+        },
+    ),
+    Tool(
+        name="send_key",
+        description="Send a single key press with optional modifier keys (e.g., Ctrl+C, Alt+F4).",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "key": {
+                    "type": "string",
+                    "description": "Key name: a-z, 0-9, enter, tab, escape, backspace, delete, up, down, left, right, home, end, pageup, pagedown, f1-f12, space, insert, printscreen",
+                },
+                "modifiers": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Modifier keys: ctrl, shift, alt, win (gui/super/meta)",
                 },
-                "required": ["key"],
             },
-        ),
-        Tool(
-            name="send_key_sequence",
-            description="Send a sequence of key steps with optional per-step delays. Useful for complex keyboard operations.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "steps": {
-                        "type": "array",
-                        "items": {
-                            "type": "object",
-                            "properties": {
-                                "key": {"type": "string", "description": "Key name"},
-                                "modifiers": {
-                                    "type": "array",
-                                    "items": {"type": "string"},
-                                    "description": "Modifier keys",
-                                },
-                                "delay_ms": {
-                                    "type": "integer",
-                                    "description": "Delay after this step in ms (default: 100)",
-                                },
+            "required": ["key"],
+        },
+    ),
+    Tool(
+        name="send_key_sequence",
+        description="Send a sequence of key steps with optional per-step delays. Useful for complex keyboard operations.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "steps": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "key": {"type": "string", "description": "Key name"},
+                            "modifiers": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "Modifier keys",
+                            },
+                            "delay_ms": {
+                                "type": "integer",
+                                "description": "Delay after this step in ms (default: 100)",
                             },
-                            "required": ["key"],
                         },
-                        "description": "List of key steps to execute",
-                    },
-                    "default_delay_ms": {
-                        "type": "integer",
-                        "description": "Default delay between steps in ms (default: 100)",
+                        "required": ["key"],
                     },
+                    "description": "List of key steps to execute",
                 },
-                "required": ["steps"],
-            },
-        ),
-        Tool(
-            name="mouse_move",
-            description="Move the mouse cursor on the target PC.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "x": {
-                        "type": "integer",
-                        "description": "X coordinate (screen pixels for absolute, offset for relative)",
-                    },
-                    "y": {
-                        "type": "integer",
-                        "description": "Y coordinate (screen pixels for absolute, offset for relative)",
-                    },
-                    "relative": {
-                        "type": "boolean",
-                        "description": "If true, move relative to current position (default: false)",
-                    },
+                "default_delay_ms": {
+                    "type": "integer",
+                    "description": "Default delay between steps in ms (default: 100)",
                 },
-                "required": ["x", "y"],
             },
-        ),
-        Tool(
-            name="mouse_click",
-            description="Click a mouse button on the target PC, optionally at a specific position.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "button": {
-                        "type": "string",
-                        "enum": ["left", "right", "middle"],
-                        "description": "Mouse button (default: left)",
-                    },
-                    "x": {
-                        "type": "integer",
-                        "description": "Optional X screen coordinate to click at",
-                    },
-                    "y": {
-                        "type": "integer",
-                        "description": "Optional Y screen coordinate to click at",
-                    },
+            "required": ["steps"],
+        },
+    ),
+    Tool(
+        name="mouse_move",
+        description="Move the mouse cursor on the target PC.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "x": {
+                    "type": "integer",
+                    "description": "X coordinate (screen pixels for absolute, offset for relative)",
                 },
-                "required": [],
-            },
-        ),
-        Tool(
-            name="mouse_drag",
-            description="Drag from one position to another (press button at start, move to end, release). Useful for drag-and-drop, selecting text, resizing windows, etc.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "start_x": {
-                        "type": "integer",
-                        "description": "Starting X screen coordinate",
-                    },
-                    "start_y": {
-                        "type": "integer",
-                        "description": "Starting Y screen coordinate",
-                    },
-                    "end_x": {
-                        "type": "integer",
-                        "description": "Ending X screen coordinate",
-                    },
-                    "end_y": {
-                        "type": "integer",
-                        "description": "Ending Y screen coordinate",
-                    },
-                    "button": {
-                        "type": "string",
-                        "enum": ["left", "right", "middle"],
-                        "description": "Mouse button (default: left)",
-                    },
+                "y": {
+                    "type": "integer",
+                    "description": "Y coordinate (screen pixels for absolute, offset for relative)",
                 },
-                "required": ["start_x", "start_y", "end_x", "end_y"],
-            },
-        ),
-        Tool(
-            name="mouse_scroll",
-            description="Scroll the mouse wheel on the target PC.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "amount": {
-                        "type": "integer",
-                        "description": "Scroll amount: positive=up, negative=down (-127 to 127)",
-                    },
+                "relative": {
+                    "type": "boolean",
+                    "description": "If true, move relative to current position (default: false)",
                 },
-                "required": ["amount"],
-            },
-        ),
-        Tool(
-            name="capture_screen",
-            description="Capture the target PC screen via HDMI capture device. Returns the image. Use sparingly as images consume many tokens.",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": [],
             },
-        ),
-        Tool(
-            name="get_screen_text",
-            description="Capture the target PC screen and extract text using OCR. Prefer this over capture_screen for text content.",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": [],
+            "required": ["x", "y"],
+        },
+    ),
+    Tool(
+        name="mouse_click",
+        description="Click a mouse button on the target PC, optionally at a specific position.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "button": {
+                    "type": "string",
+                    "enum": ["left", "right", "middle"],
+                    "description": "Mouse button (default: left)",
+                },
+                "x": {
+                    "type": "integer",
+                    "description": "Optional X screen coordinate to click at",
+                },
+                "y": {
+                    "type": "integer",
+                    "description": "Optional Y screen coordinate to click at",
+                },
             },
-        ),
-        Tool(
-            name="execute_and_read",
-            description="Type a command, press Enter, wait for output, then capture screen and OCR. Convenient for running shell commands on the target PC.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "command": {
-                        "type": "string",
-                        "description": "Command to type and execute",
-                    },
-                    "wait_seconds": {
-                        "type": "number",
-                        "description": "Seconds to wait for output (default: 1.0)",
-                    },
+            "required": [],
+        },
+    ),
+    Tool(
+        name="mouse_drag",
+        description="Drag from one position to another (press button at start, move to end, release). Useful for drag-and-drop, selecting text, resizing windows, etc.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "start_x": {
+                    "type": "integer",
+                    "description": "Starting X screen coordinate",
+                },
+                "start_y": {
+                    "type": "integer",
+                    "description": "Starting Y screen coordinate",
+                },
+                "end_x": {
+                    "type": "integer",
+                    "description": "Ending X screen coordinate",
+                },
+                "end_y": {
+                    "type": "integer",
+                    "description": "Ending Y screen coordinate",
+                },
+                "button": {
+                    "type": "string",
+                    "enum": ["left", "right", "middle"],
+                    "description": "Mouse button (default: left)",
                 },
-                "required": ["command"],
             },
-        ),
-        Tool(
-            name="get_device_info",
-            description="Show connection status and device information for the serial adapter and HDMI capture device.",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": [],
+            "required": ["start_x", "start_y", "end_x", "end_y"],
+        },
+    ),
+    Tool(
+        name="mouse_scroll",
+        description="Scroll the mouse wheel on the target PC.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "amount": {
+                    "type": "integer",
+                    "description": "Scroll amount: positive=up, negative=down (-127 to 127)",
+                },
             },
-        ),
-        Tool(
-            name="list_capture_devices",
-            description="List all available video capture devices with their index and name. Use this to find the correct HDMI capture device.",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": [],
+            "required": ["amount"],
+        },
+    ),
+    Tool(
+        name="capture_screen",
+        description="Capture the target PC screen via HDMI capture device. Returns the image. Use sparingly as images consume many tokens.",
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "required": [],
+        },
+    ),
+    Tool(
+        name="get_screen_text",
+        description="Capture the target PC screen and extract text using OCR. Prefer this over capture_screen for text content.",
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "required": [],
+        },
+    ),
+    Tool(
+        name="execute_and_read",
+        description="Type a command, press Enter, wait for output, then capture screen and OCR. Convenient for running shell commands on the target PC.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "command": {
+                    "type": "string",
+                    "description": "Command to type and execute",
+                },
+                "wait_seconds": {
+                    "type": "number",
+                    "description": "Seconds to wait for output (default: 1.0)",
+                },
             },
-        ),
-        Tool(
-            name="set_capture_resolution",
-            description="Change the HDMI capture resolution. Common values: 1920x1080, 1280x720, 640x480. The actual resolution depends on what the capture device supports.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "width": {
-                        "type": "integer",
-                        "description": "Capture width in pixels (e.g. 1920)",
-                    },
-                    "height": {
-                        "type": "integer",
-                        "description": "Capture height in pixels (e.g. 1080)",
-                    },
+            "required": ["command"],
+        },
+    ),
+    Tool(
+        name="get_device_info",
+        description="Show connection status and device information for the serial adapter and HDMI capture device.",
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "required": [],
+        },
+    ),
+    Tool(
+        name="list_capture_devices",
+        description="List all available video capture devices with their index and name. Use this to find the correct HDMI capture device.",
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "required": [],
+        },
+    ),
+    Tool(
+        name="set_capture_resolution",
+        description="Change the HDMI capture resolution. Common values: 1920x1080, 1280x720, 640x480. The actual resolution depends on what the capture device supports.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "width": {
+                    "type": "integer",
+                    "description": "Capture width in pixels (e.g. 1920)",
+                },
+                "height": {
+                    "type": "integer",
+                    "description": "Capture height in pixels (e.g. 1080)",
                 },
-                "required": ["width", "height"],
             },
-        ),
-        Tool(
-            name="set_capture_device",
-            description="Switch the active capture device by index or path. Use list_capture_devices first to see available options. Reopens the capture device.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "device": {
-                        "type": "string",
-                        "description": "Device index (e.g. '0', '1') or path (e.g. '/dev/video0')",
-                    },
+            "required": ["width", "height"],
+        },
+    ),
+    Tool(
+        name="set_capture_device",
+        description="Switch the active capture device by index or path. Use list_capture_devices first to see available options. Reopens the capture device.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "device": {
+                    "type": "string",
+                    "description": "Device index (e.g. '0', '1') or path (e.g. '/dev/video0')",
                 },
-                "required": ["device"],
             },
-        ),
-    ]
+            "required": ["device"],
+        },
+    ),
+]
+
+
+@app.list_tools()
+async def list_tools() -> list[Tool]:
+    """List available tools."""
+    return list(_TOOLS)
+
+
+async def _handle_type_text(client: KvmClient, arguments: dict[str, Any]) -> list[TextContent | ImageContent]:
+    text = arguments["text"]
+    char_delay = arguments.get("char_delay_ms")
+    raw = arguments.get("raw", False)
+    validate_chars(text)
+    client.type_text(text, char_delay, raw=raw)
+    return [TextContent(type="text", text=f"Typed {len(text)} characters")]
+
+
+async def _handle_send_key(client: KvmClient, arguments: dict[str, Any]) -> list[TextContent | ImageContent]:
+    key = arguments["key"]
+    modifiers = arguments.get("modifiers", [])
+    client.send_key(key, modifiers)
+    mod_str = "+".join(modifiers) + "+" if modifiers else ""
+    return [TextContent(type="text", text=f"Sent: {mod_str}{key}")]
+
+
+async def _handle_send_key_sequence(client: KvmClient, arguments: dict[str, Any]) -> list[TextContent | ImageContent]:
+    steps = arguments["steps"]
+    default_delay = arguments.get("default_delay_ms", 100)
+    client.send_key_sequence(steps, default_delay)
+    return [TextContent(type="text", text=f"Sent {len(steps)} key steps")]
+
+
+async def _handle_mouse_move(client: KvmClient, arguments: dict[str, Any]) -> list[TextContent | ImageContent]:
+    x = arguments["x"]
+    y = arguments["y"]
+    relative = arguments.get("relative", False)
+    client.mouse_move(x, y, relative)
+    if relative:
+        return [TextContent(type="text", text=f"Moved mouse by ({x}, {y})")]
+    else:
+        return [TextContent(type="text", text=f"Moved mouse to ({x}, {y})")]
+
+
+async def _handle_mouse_click(client: KvmClient, arguments: dict[str, Any]) -> list[TextContent | ImageContent]:
+    button = arguments.get("button", "left")
+    x = arguments.get("x")
+    y = arguments.get("y")
+    client.mouse_click(button, x, y)
+    pos_str = f" at ({x}, {y})" if x is not None and y is not None else ""
+    return [TextContent(type="text", text=f"Clicked {button}{pos_str}")]
+
+
+async def _handle_mouse_drag(client: KvmClient, arguments: dict[str, Any]) -> list[TextContent | ImageContent]:
+    start_x = arguments["start_x"]
+    start_y = arguments["start_y"]
+    end_x = arguments["end_x"]
+    end_y = arguments["end_y"]
+    button = arguments.get("button", "left")
+    client.mouse_down(button, start_x, start_y)
+    await asyncio.sleep(0.05)
+    client.mouse_move(end_x, end_y)
+    await asyncio.sleep(0.05)
+    client.mouse_up(button, end_x, end_y)
+    return [TextContent(
+        type="text",
+        text=f"Dragged {button} from ({start_x}, {start_y}) to ({end_x}, {end_y})",
+    )]
+
+
+async def _handle_mouse_scroll(client: KvmClient, arguments: dict[str, Any]) -> list[TextContent | ImageContent]:
+    amount = arguments["amount"]
+    client.mouse_scroll(amount)
+    direction = "up" if amount > 0 else "down"
+    return [TextContent(type="text", text=f"Scrolled {direction} by {abs(amount)}")]
+
+
+async def _handle_capture_screen(client: KvmClient, arguments: dict[str, Any]) -> list[TextContent | ImageContent]:
+    # The KVM server already returns JPEG — pass it through as-is
+    # when it fits, avoiding a full decode/re-encode cycle
+    jpeg_bytes, w, h = await asyncio.to_thread(client.capture_frame_jpeg, 85)
+    if config.capture_log_dir is not None:
+        _save_capture_log_async(Image.open(io.BytesIO(jpeg_bytes)), "capture")
+    if len(jpeg_bytes) > _MAX_JPEG_BYTES:
+        jpeg_bytes = _shrink_jpeg(jpeg_bytes)
+    b64_image = _b64encode(jpeg_bytes)
+    return [ImageContent(
+        type="image",
+        data=b64_image,
+        mimeType="image/jpeg",
+    )]
+
+
+async def _handle_get_screen_text(client: KvmClient, arguments: dict[str, Any]) -> list[TextContent | ImageContent]:
+    arr = await asyncio.to_thread(_capture_array)
+    if config.capture_log_dir is not None:
+        _save_capture_log_async(Image.fromarray(arr, "L"), "ocr")
+    text = await _ocr_frame(arr)
+    return [TextContent(type="text", text=text)]
+
+
+async def _handle_execute_and_read(client: KvmClient, arguments: dict[str, Any]) -> list[TextContent | ImageContent]:
+    command = arguments["command"]
+    wait_seconds = arguments.get("wait_seconds", 1.0)
+
+    # Raw mode: no tag interpretation for command text
+    validate_chars(command)
+    client.type_text(command, raw=True)
+    await asyncio.sleep(0.1)
+    client.send_key("enter")
+
+    # Warm up the OCR worker while waiting for command output,
+    # and fetch the frame off the event loop
+    ocr_ready = asyncio.create_task(_warm_ocr_pool_async())
+    await asyncio.sleep(wait_seconds)
+    arr, _ = await asyncio.gather(asyncio.to_thread(_capture_array), ocr_ready)
+    if config.capture_log_dir is not None:
+        _save_capture_log_async(Image.fromarray(arr, "L"), "exec")
+    text = await _ocr_frame(arr)
+    return [TextContent(type="text", text=text)]
+
+
+async def _handle_get_device_info(client: KvmClient, arguments: dict[str, Any]) -> list[TextContent | ImageContent]:
+    info = client.get_device_info()
+    return [TextContent(
+        type="text",
+        text=_dumps_pretty(info),
+    )]
+
+
+async def _handle_set_capture_resolution(client: KvmClient, arguments: dict[str, Any]) -> list[TextContent | ImageContent]:
+    width = arguments["width"]
+    height = arguments["height"]
+    result = client.set_capture_resolution(width, height)
+    cap_info = result.get("info", {})
+    return [TextContent(
+        type="text",
+        text=f"Resolution set: {cap_info.get('width')}x{cap_info.get('height')} (requested {width}x{height})",
+    )]
+
+
+async def _handle_list_capture_devices(client: KvmClient, arguments: dict[str, Any]) -> list[TextContent | ImageContent]:
+    result = client.list_capture_devices()
+    devices = result.get("devices", [])
+    if not devices:
+        return [TextContent(type="text", text="No capture devices found.")]
+    return [TextContent(
+        type="text",
+        text=_dumps_pretty(devices),
+    )]
+
+
+async def _handle_set_capture_device(client: KvmClient, arguments: dict[str, Any]) -> list[TextContent | ImageContent]:
+    device = arguments["device"]
+    result = client.set_capture_device(device)
+    cap_info = result.get("info", {})
+    return [TextContent(
+        type="text",
+        text=f"Switched to device {device}: {cap_info.get('width')}x{cap_info.get('height')} ({cap_info.get('backend')})",
+    )]
+
+
+# O(1) dispatch instead of a string-compare chain on every tool call
+_HANDLERS: dict[str, Callable[[KvmClient, dict[str, Any]], Awaitable[list[TextContent | ImageContent]]]] = {
+    "type_text": _handle_type_text,
+    "send_key": _handle_send_key,
+    "send_key_sequence": _handle_send_key_sequence,
+    "mouse_move": _handle_mouse_move,
+    "mouse_click": _handle_mouse_click,
+    "mouse_drag": _handle_mouse_drag,
+    "mouse_scroll": _handle_mouse_scroll,
+    "capture_screen": _handle_capture_screen,
+    "get_screen_text": _handle_get_screen_text,
+    "execute_and_read": _handle_execute_and_read,
+    "get_device_info": _handle_get_device_info,
+    "set_capture_resolution": _handle_set_capture_resolution,
+    "list_capture_devices": _handle_list_capture_devices,
+    "set_capture_device": _handle_set_capture_device,
+}
 
 
 @app.call_tool()
 async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent | ImageContent]:
     """Handle tool calls."""
+    handler = _HANDLERS.get(name)
+    if handler is None:
+        return [TextContent(type="text", text=f"Unknown tool: {name}")]
+
     try:
         client = get_client()
-
-        if name == "type_text":
-            text = arguments["text"]
-            char_delay = arguments.get("char_delay_ms")
-            raw = arguments.get("raw", False)
-            validate_chars(text)
-            result = client.type_text(text, char_delay, raw=raw)
-            return [TextContent(type="text", text=f"Typed {len(text)} characters")]
-
-        elif name == "send_key":
-            key = arguments["key"]
-            modifiers = arguments.get("modifiers", [])
-            client.send_key(key, modifiers)
-            mod_str = "+".join(modifiers) + "+" if modifiers else ""
-            return [TextContent(type="text", text=f"Sent: {mod_str}{key}")]
-
-        elif name == "send_key_sequence":
-            steps = arguments["steps"]
-            default_delay = arguments.get("default_delay_ms", 100)
-            client.send_key_sequence(steps, default_delay)
-            return [TextContent(type="text", text=f"Sent {len(steps)} key steps")]
-
-        elif name == "mouse_move":
-            x = arguments["x"]
-            y = arguments["y"]
-            relative = arguments.get("relative", False)
-            client.mouse_move(x, y, relative)
-            if relative:
-                return [TextContent(type="text", text=f"Moved mouse by ({x}, {y})")]
-            else:
-                return [TextContent(type="text", text=f"Moved mouse to ({x}, {y})")]
-
-        elif name == "mouse_click":
-            button = arguments.get("button", "left")
-            x = arguments.get("x")
-            y = arguments.get("y")
-            client.mouse_click(button, x, y)
-            pos_str = f" at ({x}, {y})" if x is not None and y is not None else ""
-            return [TextContent(type="text", text=f"Clicked {button}{pos_str}")]
-
-        elif name == "mouse_drag":
-            start_x = arguments["start_x"]
-            start_y = arguments["start_y"]
-            end_x = arguments["end_x"]
-            end_y = arguments["end_y"]
-            button = arguments.get("button", "left")
-            client.mouse_down(button, start_x, start_y)
-            await asyncio.sleep(0.05)
-            client.mouse_move(end_x, end_y)
-            await asyncio.sleep(0.05)
-            client.mouse_up(button, end_x, end_y)
-            return [TextContent(
-                type="text",
-                text=f"Dragged {button} from ({start_x}, {start_y}) to ({end_x}, {end_y})",
-            )]
-
-        elif name == "mouse_scroll":
-            amount = arguments["amount"]
-            client.mouse_scroll(amount)
-            direction = "up" if amount > 0 else "down"
-            return [TextContent(type="text", text=f"Scrolled {direction} by {abs(amount)}")]
-
-        elif name == "capture_screen":
-            image = _capture_image()
-            _save_capture_log(image, "capture")
-            # Use JPEG to keep size under 20MB (base64 limit)
-            quality = 85
-            buffer = io.BytesIO()
-            image.save(buffer, format="JPEG", quality=quality)
-            # If still too large, reduce quality then resize
-            while buffer.tell() > 10_000_000 and quality > 20:
-                quality -= 15
-                buffer = io.BytesIO()
-                image.save(buffer, format="JPEG", quality=quality)
-            if buffer.tell() > 10_000_000:
-                image = image.resize((image.width // 2, image.height // 2))
-                buffer = io.BytesIO()
-                image.save(buffer, format="JPEG", quality=60)
-            b64_image = base64.standard_b64encode(buffer.getvalue()).decode("utf-8")
-            return [ImageContent(
-                type="image",
-                data=b64_image,
-                mimeType="image/jpeg",
-            )]
-
-        elif name == "get_screen_text":
-            image = _capture_image()
-            _save_capture_log(image, "ocr")
-            text = get_ocr().extract_text(image)
-            return [TextContent(type="text", text=text)]
-
-        elif name == "execute_and_read":
-            command = arguments["command"]
-            wait_seconds = arguments.get("wait_seconds", 1.0)
-
-            # Raw mode: no tag interpretation for command text
-            validate_chars(command)
-            client.type_text(command, raw=True)
-            await asyncio.sleep(0.1)
-            client.send_key("enter")
-            await asyncio.sleep(wait_seconds)
-
-            image = _capture_image()
-            _save_capture_log(image, "exec")
-            text = get_ocr().extract_text(image)
-            return [TextContent(type="text", text=text)]
-
-        elif name == "get_device_info":
-            info = client.get_device_info()
-            return [TextContent(
-                type="text",
-                text=json.dumps(info, indent=2, ensure_ascii=False),
-            )]
-
-        elif name == "set_capture_resolution":
-            width = arguments["width"]
-            height = arguments["height"]
-            result = client.set_capture_resolution(width, height)
-            cap_info = result.get("info", {})
-            return [TextContent(
-                type="text",
-                text=f"Resolution set: {cap_info.get('width')}x{cap_info.get('height')} (requested {width}x{height})",
-            )]
-
-        elif name == "list_capture_devices":
-            result = client.list_capture_devices()
-            devices = result.get("devices", [])
-            if not devices:
-                return [TextContent(type="text", text="No capture devices found.")]
-            return [TextContent(
-                type="text",
-                text=json.dumps(devices, indent=2, ensure_ascii=False),
-            )]
-
-        elif name == "set_capture_device":
-            device = arguments["device"]
-            result = client.set_capture_device(device)
-            cap_info = result.get("info", {})
-            return [TextContent(
-                type="text",
-                text=f"Switched to device {device}: {cap_info.get('width')}x{cap_info.get('height')} ({cap_info.get('backend')})",
-            )]
-
-        else:
-            return [TextContent(type="text", text=f"Unknown tool: {name}")]
-
+        return await handler(client, arguments)
     except KvmClientError as e:
         logger.error(f"KVM server error in tool {name}: {e}")
         return [TextContent(type="text", text=f"Error: {str(e)}")]
@@ -522,6 +703,24 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent |
 
 async def run():
     """Run the MCP server."""
+    # Pay the TCP connect cost at startup, off the event loop, rather than
+    # inside the first tool call.  A failure here is not fatal — the KVM
+    # server may come up later, and get_client() will retry on first use.
+    # connect() surfaces a raw OSError (e.g. ConnectionRefusedError) when
+    # the KVM server is down, not just KvmClientError
+    try:
+        await asyncio.to_thread(get_client)
+    except (KvmClientError, OSError) as e:
+        logger.warning(f"KVM server not reachable at startup: {e}")
+
+    # Construct the in-process fallback OCR engine up front (cheap; the
+    # heavy Tesseract init inside it stays lazy)
+    get_ocr()
+
+    # Spawn the OCR worker process now so the first screen tool call
+    # doesn't pay for it
+    await _warm_ocr_pool_async()
+
     async with stdio_server() as (read_stream, write_stream):
         await app.run(read_stream, write_stream, app.create_initialization_options())
 